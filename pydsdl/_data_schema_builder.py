@@ -2,7 +2,7 @@
 # This software is distributed under the terms of the MIT License.
 # Author: Pavel Kirienko <pavel@opencyphal.org>
 
-from typing import List, Optional
+from __future__ import annotations
 from . import _error
 from . import _serializable
 from . import _bit_length_set
@@ -34,26 +34,30 @@ class SealedSerializationMode(SerializationMode):
 
 class DataSchemaBuilder:
     def __init__(self) -> None:
-        self._fields: List[_serializable.Field] = []
-        self._constants: List[_serializable.Constant] = []
-        self._serialization_mode: Optional[SerializationMode] = None
+        self._fields: list[_serializable.Field] = []
+        self._constants: list[_serializable.Constant] = []
+        self._constants_by_name: dict[str, _serializable.Constant] = {}
+        self._serialization_mode: SerializationMode | None = None
         self._is_union = False
         self._bit_length_computed_at_least_once = False
+        self._offset_cache: _bit_length_set.BitLengthSet | None = None
         self._doc = ""
 
     @property
-    def fields(self) -> List[_serializable.Field]:
-        assert all(map(lambda x: isinstance(x, _serializable.Field), self._fields))
-        return self._fields
+    def fields(self) -> list[_serializable.Field]:
+        return self._fields  # The element types are checked once on insertion.
 
     @property
-    def constants(self) -> List[_serializable.Constant]:
-        assert all(map(lambda x: isinstance(x, _serializable.Constant), self._constants))
-        return self._constants
+    def constants(self) -> list[_serializable.Constant]:
+        return self._constants  # The element types are checked once on insertion.
+
+    def get_constant(self, name: str) -> _serializable.Constant | None:
+        """Constant lookup by name in constant time; None if there is no such constant."""
+        return self._constants_by_name.get(name)
 
     @property
-    def attributes(self) -> List[_serializable.Attribute]:  # noinspection PyTypeChecker
-        out = []  # type: List[_serializable.Attribute]
+    def attributes(self) -> list[_serializable.Attribute]:  # noinspection PyTypeChecker
+        out: list[_serializable.Attribute] = []
         out += self.fields
         out += self.constants
         return out
@@ -63,7 +67,7 @@ class DataSchemaBuilder:
         return self._doc
 
     @property
-    def serialization_mode(self) -> Optional[SerializationMode]:
+    def serialization_mode(self) -> SerializationMode | None:
         return self._serialization_mode
 
     @property
@@ -80,8 +84,12 @@ class DataSchemaBuilder:
         # there is no concept of inter-field offset because a union holds exactly one field at any moment;
         # only the total offset (i.e., total size) is defined.
         self._bit_length_computed_at_least_once = True
-        ty = _serializable.UnionType if self.union else _serializable.StructureType
-        out = ty.aggregate_bit_length_sets([f.data_type for f in self.fields])
+        # Consecutive references to the offset (e.g., several assertions in a row) share the same layout,
+        # so the aggregation is only recomputed after the layout is changed.
+        if self._offset_cache is None:
+            ty = _serializable.UnionType if self.union else _serializable.StructureType
+            self._offset_cache = ty.aggregate_bit_length_sets([f.data_type for f in self.fields])
+        out = self._offset_cache
         assert isinstance(out, _bit_length_set.BitLengthSet) and len(out) > 0
         return out
 
@@ -96,10 +104,12 @@ class DataSchemaBuilder:
             )
         assert isinstance(field, _serializable.Field)
         self._fields.append(field)
+        self._offset_cache = None
 
     def add_constant(self, constant: _serializable.Constant) -> None:
         assert isinstance(constant, _serializable.Constant)
         self._constants.append(constant)
+        self._constants_by_name.setdefault(constant.name, constant)  # Name collisions are reported elsewhere.
 
     def set_serialization_mode(self, mode: SerializationMode) -> None:
         assert self._serialization_mode is None
@@ -108,3 +118,4 @@ class DataSchemaBuilder:
     def make_union(self) -> None:
         assert not self.union
         self._is_union = True
+        self._offset_cache = None
@@ -4,10 +4,9 @@
 
 from __future__ import annotations
 import logging
-from pathlib import Path
-from typing import Callable, Iterable
+from typing import Callable, Iterable, Iterator, Sequence, overload
 
-from . import _data_schema_builder, _error, _expression, _parser, _port_id_ranges, _serializable
+from . import _bit_length_set, _data_schema_builder, _error, _expression, _parser, _port_id_ranges, _serializable
 from ._dsdl import DefinitionVisitor, ReadableDSDLFile
 
 
@@ -49,6 +48,49 @@ class DataTypeNameCollisionError(DataTypeCollisionError):
 
 _logger = logging.getLogger(__name__)
 
+_NAME_SEP = _serializable.CompositeType.NAME_COMPONENT_SEPARATOR
+
+
+class LookupDefinitionList(Sequence[ReadableDSDLFile]):
+    """
+    An immutable sequence of lookup definitions indexed by the case-folded full name and version to avoid linear
+    search on every type reference. The case is folded to detect names that differ only by letter case.
+    The builder passes this sequence to the dependencies as-is, so the index is built only once rather than
+    once per definition.
+    """
+
+    def __init__(self, definitions: Iterable[ReadableDSDLFile]) -> None:
+        self._definitions = tuple(definitions)
+        self._by_name_version: dict[tuple[str, _serializable.Version], list[ReadableDSDLFile]] = {}
+        for d in self._definitions:
+            assert isinstance(d, ReadableDSDLFile)
+            self._by_name_version.setdefault((d.full_name.lower(), d.version), []).append(d)
+
+    def find(self, full_name: str, version: _serializable.Version) -> Sequence[ReadableDSDLFile]:
+        """
+        Returns the definitions whose full name matches the specified one ignoring the letter case,
+        and whose version matches exactly. The result is empty if there are no such definitions.
+        """
+        return self._by_name_version.get((full_name.lower(), version), ())
+
+    @overload
+    def __getitem__(self, index: int) -> ReadableDSDLFile: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> Sequence[ReadableDSDLFile]: ...
+
+    def __getitem__(self, index: int | slice) -> ReadableDSDLFile | Sequence[ReadableDSDLFile]:
+        return self._definitions[index]
+
+    def __len__(self) -> int:
+        return len(self._definitions)
+
+    def __iter__(self) -> Iterator[ReadableDSDLFile]:
+        return iter(self._definitions)
+
+    def __repr__(self) -> str:
+        return "%s(%r)" % (type(self).__name__, self._definitions)
+
 
 class DataTypeBuilder(_parser.StatementStreamProcessor):
 
@@ -62,53 +104,49 @@ class DataTypeBuilder(_parser.StatementStreamProcessor):
         allow_unregulated_fixed_port_id: bool,
     ):
         self._definition = definition
-        self._lookup_definitions = list(lookup_definitions)
+        self._lookup_definitions = (
+            lookup_definitions
+            if isinstance(lookup_definitions, LookupDefinitionList)
+            else LookupDefinitionList(lookup_definitions)
+        )
         self._definition_visitors = definition_visitors
         self._print_output_handler = print_output_handler
         self._allow_unregulated_fixed_port_id = allow_unregulated_fixed_port_id
         self._element_callback = None  # type: Callable[[str], None] | None
 
         assert isinstance(self._definition, ReadableDSDLFile)
-        assert all(map(lambda x: isinstance(x, ReadableDSDLFile), lookup_definitions))
         assert callable(self._print_output_handler)
         assert isinstance(self._allow_unregulated_fixed_port_id, bool)
 
-        self._structs = [_data_schema_builder.DataSchemaBuilder()]
+        # A message type has only the first builder; a service type is the request followed by the response.
+        self._request_struct = _data_schema_builder.DataSchemaBuilder()
+        self._response_struct: _data_schema_builder.DataSchemaBuilder | None = None
+        self._current_struct = self._request_struct  # Updated when the service response marker is encountered.
         self._is_deprecated = False
+        # The last evaluated _offset_ along with the bit length set it was expanded from.
+        self._offset_value: tuple[_bit_length_set.BitLengthSet, _expression.Set] | None = None
 
     def finalize(self) -> _serializable.CompositeType:
-        if len(self._structs) == 1:  # Structure type
-            (builder,) = self._structs
+        response_builder = self._response_struct
+        is_service_type = response_builder is not None
+        if response_builder is None:  # Structure type
             out = self._make_composite(
-                builder=builder,
+                builder=self._request_struct,
                 name=self._definition.full_name,
-                version=self._definition.version,
-                deprecated=self._is_deprecated,
                 fixed_port_id=self._definition.fixed_port_id,
-                source_file_path=self._definition.file_path,
                 has_parent_service=False,
             )
         else:  # Service type
-            request_builder, response_builder = self._structs
-            assert isinstance(request_builder, _data_schema_builder.DataSchemaBuilder)
-            assert isinstance(response_builder, _data_schema_builder.DataSchemaBuilder)
-            sep = _serializable.CompositeType.NAME_COMPONENT_SEPARATOR
             request = self._make_composite(
-                builder=request_builder,
-                name=sep.join([self._definition.full_name, "Request"]),
-                version=self._definition.version,
-                deprecated=self._is_deprecated,
+                builder=self._request_struct,
+                name=self._definition.full_name + _NAME_SEP + "Request",
                 fixed_port_id=None,
-                source_file_path=self._definition.file_path,
                 has_parent_service=True,
             )
             response = self._make_composite(
                 builder=response_builder,
-                name=sep.join([self._definition.full_name, "Response"]),
-                version=self._definition.version,
-                deprecated=self._is_deprecated,
+                name=self._definition.full_name + _NAME_SEP + "Response",
                 fixed_port_id=None,
-                source_file_path=self._definition.file_path,
                 has_parent_service=True,
             )
             # noinspection SpellCheckingInspection
@@ -119,21 +157,19 @@ class DataTypeBuilder(_parser.StatementStreamProcessor):
             )
 
         assert isinstance(out, _serializable.CompositeType)
-        if not self._allow_unregulated_fixed_port_id:
-            port_id = out.fixed_port_id
-            if port_id is not None:
-                is_service_type = isinstance(out, _serializable.ServiceType)
-                f = (
-                    _port_id_ranges.is_valid_regulated_service_id
-                    if is_service_type
-                    else _port_id_ranges.is_valid_regulated_subject_id
+        port_id = self._definition.fixed_port_id  # Most definitions have none, so this is checked first.
+        if port_id is not None and not self._allow_unregulated_fixed_port_id:
+            f = (
+                _port_id_ranges.is_valid_regulated_service_id
+                if is_service_type
+                else _port_id_ranges.is_valid_regulated_subject_id
+            )
+            if not f(port_id, self._definition.root_namespace):
+                raise UnregulatedFixedPortIDError(
+                    "Regulated port ID %r for %s type %r is not valid. "
+                    "Consider using allow_unregulated_fixed_port_id."
+                    % (port_id, "service" if is_service_type else "message", out.full_name)
                 )
-                if not f(port_id, out.root_namespace):
-                    raise UnregulatedFixedPortIDError(
-                        "Regulated port ID %r for %s type %r is not valid. "
-                        "Consider using allow_unregulated_fixed_port_id."
-                        % (port_id, "service" if is_service_type else "message", out.full_name)
-                    )
         return out
 
     def on_attribute_comment(self, comment: str) -> None:
@@ -142,81 +178,71 @@ class DataTypeBuilder(_parser.StatementStreamProcessor):
 
     def on_header_comment(self, comment: str) -> None:
         # Attach doc to composite type
-        self._structs[-1].set_comment(comment)
+        self._current_struct.set_comment(comment)
 
     def on_constant(self, constant_type: _serializable.SerializableType, name: str, value: _expression.Any) -> None:
         self._on_attribute()
         self._queue_attribute(
-            lambda doc: self._structs[-1].add_constant(_serializable.Constant(constant_type, name, value, doc))
+            lambda doc: self._current_struct.add_constant(_serializable.Constant(constant_type, name, value, doc))
         )
 
     def on_field(self, field_type: _serializable.SerializableType, name: str) -> None:
         self._on_attribute()
-        self._queue_attribute(lambda doc: self._structs[-1].add_field(_serializable.Field(field_type, name, doc)))
+        self._queue_attribute(lambda doc: self._current_struct.add_field(_serializable.Field(field_type, name, doc)))
 
     def on_padding_field(self, padding_field_type: _serializable.VoidType) -> None:
         self._on_attribute()
         self._queue_attribute(
-            lambda doc: self._structs[-1].add_field(_serializable.PaddingField(padding_field_type, doc))
+            lambda doc: self._current_struct.add_field(_serializable.PaddingField(padding_field_type, doc))
         )
 
     def on_directive(
         self, line_number: int, directive_name: str, associated_expression_value: _expression.Any | None
     ) -> None:
         try:
-            handler = {
-                "print": self._on_print_directive,
-                "assert": self._on_assert_directive,
-                "extent": self._on_extent_directive,
-                "sealed": self._on_sealed_directive,
-                "union": self._on_union_directive,
-                "deprecated": self._on_deprecated_directive,
-            }[directive_name]
+            handler_name = _DIRECTIVE_HANDLER_NAMES[directive_name]
         except KeyError:
             raise InvalidDirectiveError("Unknown directive %r" % directive_name) from None
-        else:
-            assert callable(handler)
-            return handler(line_number, associated_expression_value)
+        # The handler is resolved on the instance so that it can be overridden by subclasses.
+        handler: Callable[[int, _expression.Any | None], None] = getattr(self, handler_name)
+        return handler(line_number, associated_expression_value)
 
     def on_service_response_marker(self) -> None:
-        if len(self._structs) > 1:
+        if self._response_struct is not None:
             raise _error.InvalidDefinitionError("Duplicated service response marker")
 
-        self._structs.append(_data_schema_builder.DataSchemaBuilder())
-        assert len(self._structs) == 2
+        self._response_struct = _data_schema_builder.DataSchemaBuilder()
+        self._current_struct = self._response_struct
 
     def resolve_top_level_identifier(self, name: str) -> _expression.Any:
         # Look only in the current data structure. The lookup cannot cross the service request/response boundary.
-        for c in self._structs[-1].constants:
-            if c.name == name:
-                return c.value
+        c = self._current_struct.get_constant(name)
+        if c is not None:
+            return c.value
 
         if name == "_offset_":
-            bls = self._structs[-1].offset
-            assert len(bls) > 0 and all(map(lambda x: isinstance(x, int), bls))
-            # FIXME: THIS OPERATION TRIGGERS NUMERICAL EXPANSION OF THE BIT LENGTH SET.
-            # TODO: INTEGRATE THE SET EXPRESSION WITH THE BIT LENGTH SET SOLVER TO IMPROVE PERFORMANCE.
-            return _expression.Set(map(_expression.Rational, bls))
+            bls = self._current_struct.offset
+            # The schema builder returns the same bit length set object until the layout is changed,
+            # so the expanded set can be reused by consecutive references (e.g., several assertions in a row).
+            if self._offset_value is None or self._offset_value[0] is not bls:
+                # FIXME: THIS OPERATION TRIGGERS NUMERICAL EXPANSION OF THE BIT LENGTH SET.
+                # TODO: INTEGRATE THE SET EXPRESSION WITH THE BIT LENGTH SET SOLVER TO IMPROVE PERFORMANCE.
+                self._offset_value = bls, _expression.Set([_expression.Rational(x) for x in bls])
+            return self._offset_value[1]
         raise UndefinedIdentifierError("Undefined identifier: %r" % name)
 
     def resolve_versioned_data_type(self, name: str, version: _serializable.Version) -> _serializable.CompositeType:
-        if _serializable.CompositeType.NAME_COMPONENT_SEPARATOR in name:
+        if _NAME_SEP in name:
             full_name = name
         else:
-            full_name = _serializable.CompositeType.NAME_COMPONENT_SEPARATOR.join(
-                [self._definition.full_namespace, name]
-            )
+            full_name = self._definition.full_namespace + _NAME_SEP + name
             _logger.debug("The full name of a relatively referred type %r reconstructed as %r", name, full_name)
 
         del name
-        found = list(
-            filter(
-                lambda d: d.full_name.lower() == full_name.lower() and d.version == version, self._lookup_definitions
-            )
-        )
+        found = self._lookup_definitions.find(full_name, version)
         if not found:
             # Play Sherlock to help the user with mistakes like https://forum.opencyphal.org/t/904/2
-            requested_ns = full_name.split(_serializable.CompositeType.NAME_COMPONENT_SEPARATOR)[0]
+            requested_ns = full_name.split(_NAME_SEP)[0]
             lookup_nss = set(x.root_namespace for x in self._lookup_definitions)
             subroot_ns = self._definition.name_components[1] if len(self._definition.name_components) > 2 else None
             error_description = "Data type %s.%d.%d could not be found in the following root namespaces: %s. " % (
@@ -281,20 +307,20 @@ class DataTypeBuilder(_parser.StatementStreamProcessor):
         self._element_callback = None
 
     def _on_attribute(self) -> None:
-        if isinstance(self._structs[-1].serialization_mode, _data_schema_builder.DelimitedSerializationMode):
+        if isinstance(self._current_struct.serialization_mode, _data_schema_builder.DelimitedSerializationMode):
             raise InvalidDirectiveError(
                 "The extent directive can only be placed after the last attribute definition in the schema. "
                 "This is to prevent errors if the extent is dependent on the bit length set of the data schema."
             )
 
     def _on_print_directive(self, line_number: int, value: _expression.Any | None) -> None:
-        _logger.info(
-            "Print directive at %s:%d%s",
-            self._definition.file_path,
-            line_number,
-            (": %s" % value) if value is not None else " (no value to print)",
-        )
-        self._print_output_handler(line_number, str(value if value is not None else ""))
+        # The value is passed to the logger as-is so that it is not formatted unless the log level is enabled.
+        if value is not None:
+            _logger.info("Print directive at %s:%d: %s", self._definition.file_path, line_number, value)
+            self._print_output_handler(line_number, str(value))
+        else:
+            _logger.info("Print directive at %s:%d (no value to print)", self._definition.file_path, line_number)
+            self._print_output_handler(line_number, "")
 
     def _on_assert_directive(self, line_number: int, value: _expression.Any | None) -> None:
         if isinstance(value, _expression.Boolean):
@@ -309,15 +335,15 @@ class DataTypeBuilder(_parser.StatementStreamProcessor):
             raise InvalidDirectiveError("The assertion check expression must yield a boolean, not %s" % value.TYPE_NAME)
 
     def _on_extent_directive(self, line_number: int, value: _expression.Any | None) -> None:
-        if self._structs[-1].serialization_mode is not None:
+        if self._current_struct.serialization_mode is not None:
             raise InvalidDirectiveError(
                 "Misplaced extent directive. The serialization mode is already set to %s"
-                % self._structs[-1].serialization_mode
+                % self._current_struct.serialization_mode
             )
         if value is None:
             raise InvalidDirectiveError("The extent directive requires an expression")
         if isinstance(value, _expression.Rational):
-            struct = self._structs[-1]
+            struct = self._current_struct
             bits = value.as_native_integer()
             struct.set_serialization_mode(_data_schema_builder.DelimitedSerializationMode(bits))
             _logger.debug("The extent is set to %d bits at %s:%d", bits, self._definition.file_path, line_number)
@@ -325,55 +351,55 @@ class DataTypeBuilder(_parser.StatementStreamProcessor):
             raise InvalidDirectiveError("The extent directive expects a rational, not %s" % value.TYPE_NAME)
 
     def _on_sealed_directive(self, _ln: int, value: _expression.Any | None) -> None:
-        if self._structs[-1].serialization_mode is not None:
+        if self._current_struct.serialization_mode is not None:
             raise InvalidDirectiveError(
                 "Misplaced sealing directive. The serialization mode is already set to %s"
-                % self._structs[-1].serialization_mode
+                % self._current_struct.serialization_mode
             )
         if value is not None:
             raise InvalidDirectiveError("The sealed directive does not expect an expression")
-        self._structs[-1].set_serialization_mode(_data_schema_builder.SealedSerializationMode())
+        self._current_struct.set_serialization_mode(_data_schema_builder.SealedSerializationMode())
 
     def _on_union_directive(self, _ln: int, value: _expression.Any | None) -> None:
         if value is not None:
             raise InvalidDirectiveError("The union directive does not expect an expression")
-        if self._structs[-1].union:
+        if self._current_struct.union:
             raise InvalidDirectiveError("Duplicated union directive")
-        if self._structs[-1].attributes:
+        if self._current_struct.attributes:
             raise InvalidDirectiveError("The union directive must be placed before the first " "attribute definition")
-        self._structs[-1].make_union()
+        self._current_struct.make_union()
 
     def _on_deprecated_directive(self, _ln: int, value: _expression.Any | None) -> None:
         if value is not None:
             raise InvalidDirectiveError("The deprecated directive does not expect an expression")
         if self._is_deprecated:
             raise InvalidDirectiveError("Duplicated deprecated directive")
-        if len(self._structs) > 1:
+        if self._response_struct is not None:
             raise InvalidDirectiveError("The deprecated directive cannot be placed in the response section")
-        if self._structs[-1].attributes:
+        if self._current_struct.attributes:
             raise InvalidDirectiveError(
                 "The deprecated directive must be placed before the first " "attribute definition"
             )
         self._is_deprecated = True
 
-    @staticmethod
-    def _make_composite(  # pylint: disable=too-many-arguments
+    def _make_composite(
+        self,
         builder: _data_schema_builder.DataSchemaBuilder,
         name: str,
-        version: _serializable.Version,
-        deprecated: bool,
         fixed_port_id: int | None,
-        source_file_path: Path,
         has_parent_service: bool,
     ) -> _serializable.CompositeType:
+        """
+        The version, deprecation status, and source file are shared by all composites of the definition.
+        """
         ty = _serializable.UnionType if builder.union else _serializable.StructureType
         inner = ty(
             name=name,
-            version=version,
+            version=self._definition.version,
             attributes=builder.attributes,
-            deprecated=deprecated,
+            deprecated=self._is_deprecated,
             fixed_port_id=fixed_port_id,
-            source_file_path=source_file_path,
+            source_file_path=self._definition.file_path,
             has_parent_service=has_parent_service,
             doc=builder.doc,
         )  # type: _serializable.CompositeType
@@ -402,3 +428,52 @@ class DataTypeBuilder(_parser.StatementStreamProcessor):
         The numbers are subject to change between minor revisions.
         """
         return max(64, model.extent * 2 // 8)
+
+
+# The handlers are named rather than referenced so that they are looked up on the instance.
+# Each handler validates the presence of the expression itself because the order of the checks differs between them.
+_DIRECTIVE_HANDLER_NAMES = {
+    "print": "_on_print_directive",
+    "assert": "_on_assert_directive",
+    "extent": "_on_extent_directive",
+    "sealed": "_on_sealed_directive",
+    "union": "_on_union_directive",
+    "deprecated": "_on_deprecated_directive",
+}
+
+
+def _unittest_lookup_definition_list(temp_dsdl_factory) -> None:  # type: ignore
+    from pathlib import Path
+    from . import _dsdl_definition
+    from ._serializable import Version
+
+    paths = [
+        temp_dsdl_factory.new_file(Path("root", "ns", "Ontario.1.0.dsdl"), "@sealed"),
+        temp_dsdl_factory.new_file(Path("root", "ns", "Ontario.2.0.dsdl"), "@sealed"),
+    ]
+    lookup = LookupDefinitionList(_dsdl_definition.DSDLDefinition(p, p.parent) for p in paths)
+    assert len(lookup) == 2
+    assert [d.version for d in lookup.find("ns.Ontario", Version(2, 0))] == [Version(2, 0)]
+    assert [d.version for d in lookup.find("NS.ONTARIO", Version(1, 0))] == [Version(1, 0)]
+    assert not lookup.find("ns.Ontario", Version(3, 0))
+    assert not lookup.find("ns.Quebec", Version(1, 0))
+    assert list(lookup) == [lookup[0], lookup[1]]
+    assert lookup[0].version == Version(1, 0)
+
+
+def _unittest_lookup_definition_list_case_insensitive(temp_dsdl_factory) -> None:  # type: ignore
+    from pathlib import Path
+    from . import _dsdl_definition
+    from ._serializable import Version
+
+    paths = [
+        temp_dsdl_factory.new_file(Path("a", "ns", "Alberta.1.0.dsdl"), "@sealed"),
+        temp_dsdl_factory.new_file(Path("b", "NS", "ALBERTA.1.0.dsdl"), "@sealed"),
+        temp_dsdl_factory.new_file(Path("a", "ns", "Yukon.1.0.dsdl"), "@sealed"),
+    ]
+    lookup = LookupDefinitionList(_dsdl_definition.DSDLDefinition(p, p.parent) for p in paths)
+    # Names differing only by letter case are found together so that the caller can report the collision.
+    for name in ("ns.Alberta", "NS.ALBERTA", "nS.aLbErTa"):
+        assert sorted(d.full_name for d in lookup.find(name, Version(1, 0))) == ["NS.ALBERTA", "ns.Alberta"]
+    assert [d.full_name for d in lookup.find("NS.yukon", Version(1, 0))] == ["ns.Yukon"]
+    assert not lookup.find("ns.Alberta", Version(1, 1))
@@ -9,7 +9,7 @@ from pathlib import Path
 from typing import Callable, Iterable, Type
 
 from . import _parser
-from ._data_type_builder import DataTypeBuilder, UndefinedDataTypeError
+from ._data_type_builder import DataTypeBuilder, LookupDefinitionList, UndefinedDataTypeError
 from ._dsdl import DefinitionVisitor, ReadableDSDLFile
 from ._error import FrontendError, InternalError, InvalidDefinitionError
 from ._serializable import CompositeType, Version
@@ -218,9 +218,13 @@ class DSDLDefinition(ReadableDSDLFile):
         for nc in namespace_components:
             if CompositeType.NAME_COMPONENT_SEPARATOR in nc:
                 raise FileNameFormatError(f"Invalid name for namespace component: {nc!r}", path=self._file_path)
-        self._name: str = CompositeType.NAME_COMPONENT_SEPARATOR.join(namespace_components + [str(short_name)])
+        self._name_components = namespace_components + [str(short_name)]
+        self._name: str = CompositeType.NAME_COMPONENT_SEPARATOR.join(self._name_components)
+        # The definition identity never changes, so the hashing key is computed only once.
+        self._key = (self._name, self._version)
 
         self._cached_type: CompositeType | None = None
+        self._read_in_progress = False
 
     # +-----------------------------------------------------------------------+
     # | ReadableDSDLFile :: INTERFACE                                         |
@@ -236,23 +240,31 @@ class DSDLDefinition(ReadableDSDLFile):
         print_output_handler: Callable[[int, str], None],
         allow_unregulated_fixed_port_id: bool,
     ) -> CompositeType:
-        log_prefix = "%s.%d.%d" % (self.full_name, self.version.major, self.version.minor)
-        if self._cached_type is not None:
-            _logger.debug("%s: Cache hit", log_prefix)
+        if self._cached_type is not None:  # This is the common case, so the message is not formatted eagerly.
+            _logger.debug("%s.%d.%d: Cache hit", self.full_name, self.version.major, self.version.minor)
             return self._cached_type
 
-        started_at = time.monotonic()
+        log_prefix = "%s.%d.%d" % (self.full_name, self.version.major, self.version.minor)
 
-        # Remove the target definition from the lookup list in order to prevent
-        # infinite recursion on self-referential definitions.
-        lookup_definitions = list(filter(lambda d: d != self, lookup_definitions))
+        # Self-referential definitions are detected here instead of removing the target definition from the
+        # lookup list, which would require copying the list on every read. The error is raised before the
+        # try block below so that its location is that of the referring definition.
+        if self._read_in_progress:
+            raise UndefinedDataTypeError("Circular dependency: %s refers to itself directly or indirectly" % log_prefix)
 
-        _logger.debug(
-            "%s: Starting processing with %d lookup definitions located in root namespaces: %s",
-            log_prefix,
-            len(lookup_definitions),
-            ", ".join(set(sorted(map(lambda x: x.root_namespace, lookup_definitions)))),
-        )
+        started_at = time.monotonic()
+
+        if _logger.isEnabledFor(logging.DEBUG):
+            # Keep the indexed lookup list intact.
+            if not isinstance(lookup_definitions, (list, tuple, LookupDefinitionList)):
+                lookup_definitions = list(lookup_definitions)
+            _logger.debug(
+                "%s: Starting processing with %d lookup definitions located in root namespaces: %s",
+                log_prefix,
+                len(lookup_definitions),
+                ", ".join(set(sorted(map(lambda x: x.root_namespace, lookup_definitions)))),
+            )
+        self._read_in_progress = True
         try:
             builder = DataTypeBuilder(
                 definition=self,
@@ -280,6 +292,8 @@ class DSDLDefinition(ReadableDSDLFile):
             raise
         except Exception as ex:  # pragma: no cover
             raise InternalError(culprit=ex, path=self.file_path) from ex
+        finally:
+            self._read_in_progress = False
 
     # +-----------------------------------------------------------------------+
     # | DSDLFile :: INTERFACE                                                 |
@@ -294,25 +308,29 @@ class DSDLDefinition(ReadableDSDLFile):
 
     @property
     def name_components(self) -> list[str]:
-        return self._name.split(CompositeType.NAME_COMPONENT_SEPARATOR)
+        return self._name_components[:]
 
     @property
     def short_name(self) -> str:
-        return self.name_components[-1]
+        return self._name_components[-1]
 
     @property
     def full_namespace(self) -> str:
-        return str(CompositeType.NAME_COMPONENT_SEPARATOR.join(self.name_components[:-1]))
+        return str(CompositeType.NAME_COMPONENT_SEPARATOR.join(self._name_components[:-1]))
 
     @property
     def root_namespace(self) -> str:
-        return self.name_components[0]
+        return self._name_components[0]
 
     @property
     def text(self) -> str:
         if self._text is None:
-            with open(self._file_path) as f:
-                self._text = str(f.read())
+            # Bypass the text I/O layer; the newlines are translated like in universal newlines mode only if needed.
+            with open(self._file_path, "rb") as f:
+                text = f.read().decode("utf8")
+            if "\r" in text:
+                text = text.replace("\r\n", "\n").replace("\r", "\n")
+            self._text = text
         return self._text
 
     @property
@@ -335,7 +353,7 @@ class DSDLDefinition(ReadableDSDLFile):
     # | Python :: SPECIAL FUNCTIONS                                           |
     # +-----------------------------------------------------------------------+
     def __hash__(self) -> int:
-        return hash((self.full_name, self.version))
+        return hash(self._key)
 
     def __eq__(self, other: object) -> bool:
         """
@@ -343,7 +361,7 @@ class DSDLDefinition(ReadableDSDLFile):
         Definitions of the same name but different versions are not considered equal.
         """
         if isinstance(other, DSDLDefinition):
-            return self.full_name == other.full_name and self.version == other.version
+            return self._key == other._key
         return NotImplemented  # pragma: no cover
 
     def __str__(self) -> str:
@@ -385,6 +403,27 @@ def _unittest_dsdl_definition_read_text(temp_dsdl_factory) -> None:  # type: ign
     assert "@sealed" == target_definition.text
 
 
+def _unittest_dsdl_definition_read_text_crlf_utf8(temp_dsdl_factory) -> None:  # type: ignore
+    dsdl_file = temp_dsdl_factory.new_file(Path("root", "ns", "Crlf.1.0.dsdl"))
+    dsdl_file.write_bytes("# Привет\r\nuint8 a\r\n@sealed\r\n".encode("utf8"))
+    target_definition = DSDLDefinition(dsdl_file, dsdl_file.parent)
+    assert "# Привет\nuint8 a\n@sealed\n" == target_definition.text
+    t = target_definition.read([], [], lambda *_: None, True)
+    assert t.doc == "Привет"
+    assert [f.name for f in t.fields] == ["a"]
+
+
+def _unittest_dsdl_definition_read_text_lone_cr(temp_dsdl_factory) -> None:  # type: ignore
+    dsdl_file = temp_dsdl_factory.new_file(Path("root", "ns", "Cr.1.0.dsdl"))
+    dsdl_file.write_bytes(b"# header\ruint8 a\r# doc\ruint8 b\r@sealed\r")
+    target_definition = DSDLDefinition(dsdl_file, dsdl_file.parent)
+    assert "# header\nuint8 a\n# doc\nuint8 b\n@sealed\n" == target_definition.text
+    t = target_definition.read([], [], lambda *_: None, True)
+    assert t.doc == "header"
+    assert [f.name for f in t.fields] == ["a", "b"]
+    assert t.fields[0].doc == "doc"
+
+
 def _unittest_dsdl_definition_issue_111(temp_dsdl_factory) -> None:  # type: ignore
     target_root = Path("root", "ns")
     target_file_path = Path(target_root / "Target.1.1.dsdl")
@@ -35,6 +35,8 @@ class Any(abc.ABC):
     Instances of this type can be pickled.
     """
 
+    __slots__ = ()  # Allows the derived classes to opt out of the instance dict.
+
     TYPE_NAME = None  # type: str
     """
     The DSDL-name of the data type implemented by the class, as defined in Specification.
@@ -6,7 +6,7 @@
 
 import abc
 import typing
-import functools
+import operator
 from . import _any, _primitive, _operator
 
 
@@ -55,18 +55,30 @@ class Set(Container):
                 "of associated type deduction issues. This may change later."
             )
 
-        element_types = set(map(type, list_of_elements))
-        if len(element_types) != 1:
+        # The type of the first element is probed once and the others are compared against it until a mismatch.
+        self._element_type = type(list_of_elements[0])  # type: typing.Type[_any.Any]
+        if not all(type(e) is self._element_type for e in list_of_elements):
             # This also weeds out covariant sets, although our barbie-size type system is unaware of that.
             raise _any.InvalidOperandError("Heterogeneous sets are not permitted")
 
-        # noinspection PyTypeChecker
-        self._element_type = list(element_types)[0]  # type: typing.Type[_any.Any]
         self._value = frozenset(list_of_elements)  # type: typing.FrozenSet[_any.Any]
 
         if not issubclass(self._element_type, _any.Any):
             raise ValueError("Invalid element type: %r" % self._element_type)
 
+    @staticmethod
+    def _from_homogeneous(value: typing.FrozenSet[_any.Any], element_type: typing.Type[_any.Any]) -> "Set":
+        """
+        Constructs a set from elements that are already known to be of the specified type, such as those produced
+        by set algebra on homotypic sets, without copying and re-validating them.
+        """
+        if not value:
+            return Set(value)  # Let the constructor report the error.
+        out = Set.__new__(Set)
+        out._element_type = element_type
+        out._value = value
+        return out
+
     def __iter__(self) -> typing.Iterator[typing.Any]:
         return iter(self._value)
 
@@ -102,23 +114,23 @@ class Set(Container):
 
     @_Decorator.homotypic_binary_operator
     def _is_proper_superset_of(self, right: "Set") -> bool:
-        return self._is_superset_of(right) and not self._is_equal_to(right)
+        return self._value > right._value
 
     @_Decorator.homotypic_binary_operator
     def _is_proper_subset_of(self, right: "Set") -> bool:
-        return self._is_subset_of(right) and not self._is_equal_to(right)
+        return self._value < right._value
 
     @_Decorator.homotypic_binary_operator
     def _create_union_with(self, right: "Set") -> "Set":
-        return Set(self._value.union(right._value))
+        return Set._from_homogeneous(self._value.union(right._value), self._element_type)
 
     @_Decorator.homotypic_binary_operator
     def _create_intersection_with(self, right: "Set") -> "Set":
-        return Set(self._value.intersection(right._value))
+        return Set._from_homogeneous(self._value.intersection(right._value), self._element_type)
 
     @_Decorator.homotypic_binary_operator
     def _create_disjunctive_union_with(self, right: "Set") -> "Set":
-        return Set(self._value.symmetric_difference(right._value))
+        return Set._from_homogeneous(self._value.symmetric_difference(right._value), self._element_type)
 
     #
     # Set comparison.
@@ -174,7 +186,28 @@ class Set(Container):
         self, impl: typing.Callable[[_any.Any, _any.Any], _any.Any], other: _any.Any, swap: bool = False
     ) -> "Set":
         if not isinstance(other, Set):
-            return Set((impl(other, x) if swap else impl(x, other)) for x in self)
+            native = _NATIVE_RATIONAL_OPERATORS.get(impl)
+            if (
+                native is not None
+                and self._element_type is _primitive.Rational
+                and isinstance(other, _primitive.Rational)
+            ):
+                # Fast path for the common case of arithmetic on bit length sets (e.g., "_offset_ % 8"):
+                # operate on the native values directly bypassing the generic operator dispatch for every element.
+                o = other.native_value
+                elements = typing.cast(typing.FrozenSet[_primitive.Rational], self._value)  # Checked above.
+                try:
+                    if swap:
+                        values = frozenset([_primitive.Rational(native(o, x.native_value)) for x in elements])
+                    else:
+                        values = frozenset([_primitive.Rational(native(x.native_value, o)) for x in elements])
+                    return Set._from_homogeneous(values, _primitive.Rational)
+                except ZeroDivisionError:
+                    pass  # Let the generic path report the error properly.
+            # The operand order is decided once for the whole set rather than for every element.
+            if swap:
+                return Set([impl(other, x) for x in self._value])
+            return Set([impl(x, other) for x in self._value])
         raise _any.UndefinedOperatorError
 
     def _add(self, right: _any.Any) -> "Set":
@@ -217,11 +250,16 @@ class Set(Container):
     # Attributes
     #
     def _attribute(self, name: "_primitive.String") -> _any.Any:
-        if name.native_value == "min":
-            out = functools.reduce(lambda a, b: a if _operator.less(a, b) else b, self)
-            assert isinstance(out, self.element_type)
-        elif name.native_value == "max":
-            out = functools.reduce(lambda a, b: a if _operator.greater(a, b) else b, self)
+        if self._element_type is _primitive.Rational and name.native_value in ("min", "max"):
+            # Fast path for rationals (e.g., bit length sets): the native values are totally ordered.
+            out = (min if name.native_value == "min" else max)(self._value, key=operator.attrgetter("native_value"))
+        elif name.native_value in ("min", "max"):
+            is_preferred = _operator.less if name.native_value == "min" else _operator.greater
+            it = iter(self._value)
+            out = next(it)  # Empty sets are not permitted.
+            for x in it:
+                if not is_preferred(out, x):
+                    out = x
             assert isinstance(out, self.element_type)
         elif name.native_value == "count":  # "size" and "length" can be ambiguous, "cardinality" is long
             out = _primitive.Rational(len(self._value))
@@ -230,3 +268,13 @@ class Set(Container):
 
         assert isinstance(out, _any.Any)
         return out
+
+
+# Native implementations of the elementwise operators used by the rational set fast path.
+# Power is excluded because it may yield irrational results which require special handling.
+_NATIVE_RATIONAL_OPERATORS: typing.Dict[typing.Any, typing.Callable[[typing.Any, typing.Any], typing.Any]] = {
+    _operator.add: operator.add,
+    _operator.subtract: operator.sub,
+    _operator.multiply: operator.mul,
+    _operator.modulo: operator.mod,
+}
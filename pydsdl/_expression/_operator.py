@@ -41,13 +41,13 @@ def _auto_swap(
             try:
                 result = direct_operator(left, right)
             except _any.UndefinedOperatorError:
-                if type(left) != type(right):  # pylint: disable=unidiomatic-typecheck
+                if type(left) is not type(right):  # pylint: disable=unidiomatic-typecheck
                     result = getattr(right, alternative_method_name)(left)  # Left and Right are swapped.
                 else:
                     raise
 
             assert isinstance(result, _any.Any)
-            return typing.cast(OperatorOutput, result)
+            return result
 
         return wrapper
 
@@ -74,11 +74,16 @@ class Boolean(Primitive):
 class Rational(Primitive):
     TYPE_NAME = "rational"
 
-    def __init__(self, value: typing.Union[int, fractions.Fraction]):
+    def __init__(self, value: typing.Union[int, float, fractions.Fraction]):
         # We must support float as well, because some operators on Fraction sometimes yield float, e.g. power.
         if not isinstance(value, (int, float, fractions.Fraction)):
             raise ValueError("Cannot construct a Rational instance from " + type(value).__name__)
-        self._value = fractions.Fraction(value)  # type: fractions.Fraction
+        # Fractions are immutable, so an existing instance (e.g., the result of an operator) need not be copied.
+        # The exact type is checked because subclasses of Fraction may have different semantics.
+        if type(value) is fractions.Fraction:  # pylint: disable=unidiomatic-typecheck
+            self._value = value  # type: fractions.Fraction
+        else:
+            self._value = fractions.Fraction(value)
 
     @property
     def native_value(self) -> fractions.Fraction:
@@ -99,7 +104,10 @@ class Rational(Primitive):
         return self._value.denominator == 1
 
     def __hash__(self) -> int:
-        return hash(self._value)
+        # Integers hash the same as their fractional representation, but hashing a Fraction is much slower.
+        # Sets of integers are very common here because bit length sets are expanded into them.
+        value = self._value
+        return hash(value.numerator) if value.denominator == 1 else hash(value)
 
     def __eq__(self, other: object) -> bool:
         if isinstance(other, Rational):
@@ -113,7 +121,7 @@ class Rational(Primitive):
     # Unary operators.
     #
     def _positive(self) -> "Rational":
-        return Rational(+self._value)
+        return self  # Immutable, so the unary plus need not make a copy.
 
     def _negative(self) -> "Rational":
         return Rational(-self._value)
@@ -225,10 +233,6 @@ class String(Primitive):
 
     def _equal(self, right: _any.Any) -> Boolean:
         if isinstance(right, String):
-
-            def normalized(s: str) -> str:
-                return unicodedata.normalize("NFC", s)
-
-            return Boolean(normalized(self._value) == normalized(right._value))
+            return Boolean(unicodedata.normalize("NFC", self._value) == unicodedata.normalize("NFC", right._value))
 
         raise _any.UndefinedOperatorError
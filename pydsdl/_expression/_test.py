@@ -39,9 +39,24 @@ def _unittest_expressions() -> None:
         [_container.Set([s("abc123"), s("abc456")]), _container.Set([s("abc789"), s("abc987")])]
     )
 
+    assert _operator.modulo(_container.Set([r(8), r(12), r(16)]), r(8)) == _container.Set([r(0), r(4)])
+    assert _operator.subtract(r(20), _container.Set([r(8), r(12)])) == _container.Set([r(12), r(8)])
+    assert _operator.multiply(_container.Set([r(1), r(2)]), r(fractions.Fraction(1, 2))) == _container.Set(
+        [r(fractions.Fraction(1, 2)), r(1)]
+    )
+
+    assert _operator.less(_container.Set([r(1)]), _container.Set([r(1), r(2)]))
+    assert not _operator.less(_container.Set([r(1), r(2)]), _container.Set([r(1), r(2)]))
+    assert _operator.greater(_container.Set([r(1), r(2)]), _container.Set([r(2)]))
+    assert not _operator.greater(_container.Set([r(1)]), _container.Set([r(2)]))
+
     assert _operator.attribute(_container.Set([r(1), r(2), r(3), r(-4), r(-5)]), s("min")) == r(-5)
     assert _operator.attribute(_container.Set([r(1), r(2), r(3), r(-4), r(-5)]), s("max")) == r(3)
 
+    nested = _container.Set([_container.Set([r(1)]), _container.Set([r(1), r(2)]), _container.Set([r(1), r(2), r(3)])])
+    assert _operator.attribute(nested, s("min")) == _container.Set([r(1)])
+    assert _operator.attribute(nested, s("max")) == _container.Set([r(1), r(2), r(3)])
+
 
 def _unittest_textual_representations() -> None:
     assert str(_primitive.Rational(fractions.Fraction(123, 456))) == "41/152"
@@ -105,8 +120,27 @@ def _unittest_basic() -> None:
     with raises(ValueError):
         _container.Set([123])  # type: ignore
 
+    with raises(_any.InvalidOperandError, match=".*Heterogeneous.*"):
+        _container.Set([_primitive.Rational(1), _primitive.Rational(2), _primitive.String("3")])
+
+    with raises(_any.InvalidOperandError, match=".*Heterogeneous.*"):
+        _container.Set([_primitive.Boolean(True), _container.Set([_primitive.Boolean(True)])])
+
+    assert hash(_primitive.Rational(-123)) == hash(-123) == hash(fractions.Fraction(-123))
+    assert hash(_primitive.Rational(fractions.Fraction(-9, 7))) == hash(fractions.Fraction(-9, 7))
+
+    frac = fractions.Fraction(-9, 7)
+    assert _primitive.Rational(frac).native_value is frac  # Immutable, no copy needed.
+    assert _primitive.Rational(1.5).native_value == fractions.Fraction(3, 2)
+
+    assert _operator.positive(_primitive.Rational(-123)) == _primitive.Rational(-123)
+    assert _operator.negative(_primitive.Rational(-123)) == _primitive.Rational(123)
+
     assert _primitive.Rational(123).is_integer()
     assert not _primitive.Rational(fractions.Fraction(123, 124)).is_integer()
     assert _primitive.Rational(-123).as_native_integer() == -123
     with raises(_any.InvalidOperandError):
         _primitive.Rational(fractions.Fraction(123, 124)).as_native_integer()
+
+    with raises(_any.InvalidOperandError):
+        _operator.modulo(_container.Set([_primitive.Rational(1)]), _primitive.Rational(0))
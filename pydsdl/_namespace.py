@@ -126,9 +126,10 @@ def read_namespace(
     if not target_dsdl_definitions:
         _logger.info("The namespace at %s is empty", root_namespace_directory)
         return []
-    _logger.debug("Target DSDL definitions are listed below:")
-    for x in target_dsdl_definitions:
-        _logger.debug(_LOG_LIST_ITEM_PREFIX + str(x))
+    if _logger.isEnabledFor(logging.DEBUG):
+        _logger.debug("Target DSDL definitions are listed below:")
+        for x in target_dsdl_definitions:
+            _logger.debug(_LOG_LIST_ITEM_PREFIX + str(x))
 
     return _complete_read_function(
         target_dsdl_definitions, lookup_directories_path_list, print_output_handler, allow_unregulated_fixed_port_id
@@ -291,9 +292,10 @@ def _complete_read_function(
 
     lookup_dsdl_definitions = _construct_dsdl_definitions_from_namespaces(lookup_directories_path_list)
 
-    _logger.debug("Lookup DSDL definitions are listed below:")
-    for x in lookup_dsdl_definitions:
-        _logger.debug(_LOG_LIST_ITEM_PREFIX + str(x))
+    if _logger.isEnabledFor(logging.DEBUG):
+        _logger.debug("Lookup DSDL definitions are listed below:")
+        for x in lookup_dsdl_definitions:
+            _logger.debug(_LOG_LIST_ITEM_PREFIX + str(x))
 
     _logger.info(
         "Reading %d definitions from the root namespace %s, "
@@ -355,9 +357,10 @@ def _construct_lookup_directories_path_list(
     # Normalize paths and remove duplicates. Resolve symlinks to avoid ambiguities.
     lookup_directories_path_list.extend(root_namespace_directories)
     lookup_directories_path_list = list(sorted({x.resolve() for x in lookup_directories_path_list}))
-    _logger.debug("Lookup directories are listed below:")
-    for a in lookup_directories_path_list:
-        _logger.debug(_LOG_LIST_ITEM_PREFIX + str(a))
+    if _logger.isEnabledFor(logging.DEBUG):
+        _logger.debug("Lookup directories are listed below:")
+        for a in lookup_directories_path_list:
+            _logger.debug(_LOG_LIST_ITEM_PREFIX + str(a))
 
     # Check for common usage errors and warn the user if anything looks suspicious.
     _ensure_no_common_usage_errors(root_namespace_directories, lookup_directories_path_list, _logger.warning)
@@ -414,24 +417,31 @@ def _construct_dsdl_definitions_from_namespaces(
 
 
 def _ensure_no_fixed_port_id_collisions(types: list[_serializable.CompositeType]) -> None:
+    # Only the types of the same kind sharing the same fixed port ID can collide, so instead of comparing every
+    # type against every other type, the candidates are grouped by the kind and the port ID in one pass.
+    by_port_id = collections.defaultdict(list)  # type: DefaultDict[tuple[bool, int], list[_serializable.CompositeType]]
+    for t in types:
+        if t.fixed_port_id is not None:
+            by_port_id[isinstance(t, _serializable.ServiceType), t.fixed_port_id].append(t)
+
     for a in types:
-        for b in types:
+        if a.fixed_port_id is None:
+            continue
+        for b in by_port_id[isinstance(a, _serializable.ServiceType), a.fixed_port_id]:
+            # The group holds only the types of the same kind, because port ID sets of subjects and services are
+            # orthogonal, and with the same fixed port ID; only the name and the version remain to be checked.
+            assert isinstance(a, _serializable.ServiceType) == isinstance(b, _serializable.ServiceType)
+            assert a.fixed_port_id == b.fixed_port_id
             different_names = a.full_name != b.full_name
             different_major_versions = a.version.major != b.version.major
-            # Must be the same kind because port ID sets of subjects and services are orthogonal
-            same_kind = isinstance(a, _serializable.ServiceType) == isinstance(b, _serializable.ServiceType)
             # Data types where the major version is zero are allowed to collide
             both_released = (a.version.major > 0) and (b.version.major > 0)
 
-            fpid_must_be_different = same_kind and (different_names or (different_major_versions and both_released))
-
-            if fpid_must_be_different:
-                if a.has_fixed_port_id and b.has_fixed_port_id:
-                    if a.fixed_port_id == b.fixed_port_id:
-                        raise FixedPortIDCollisionError(
-                            "The fixed port ID of this definition is also used in %s" % b.source_file_path,
-                            path=a.source_file_path,
-                        )
+            if different_names or (different_major_versions and both_released):
+                raise FixedPortIDCollisionError(
+                    "The fixed port ID of this definition is also used in %s" % b.source_file_path,
+                    path=a.source_file_path,
+                )
 
 
 def _ensure_minor_version_compatibility(types: list[_serializable.CompositeType]) -> None:
@@ -445,7 +455,8 @@ def _ensure_minor_version_compatibility(types: list[_serializable.CompositeType]
             by_major[t.version.major].append(t)
 
         for subject_to_check in by_major.values():
-            _logger.debug("Minor version compatibility check amongst: %s", [str(x) for x in subject_to_check])
+            if _logger.isEnabledFor(logging.DEBUG):
+                _logger.debug("Minor version compatibility check amongst: %s", [str(x) for x in subject_to_check])
             for a in subject_to_check:
                 for b in subject_to_check:
                     if a is not b:
@@ -9,16 +9,21 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import cast
 
+from ._data_type_builder import LookupDefinitionList
 from ._dsdl import DefinitionVisitor, DSDLFile, ReadableDSDLFile, PrintOutputHandler, SortedFileList
 from ._dsdl import file_sort as dsdl_file_sort
 from ._error import FrontendError, InternalError
 from ._serializable._composite import CompositeType
 
 
+def _ignore_print_output(line: int, message: str) -> None:  # pylint: disable=unused-argument
+    """Used when the caller did not provide an output handler; shared by all definitions."""
+
+
 # pylint: disable=too-many-arguments
 def _read_definitions(
     target_definitions: SortedFileList[ReadableDSDLFile],
-    lookup_definitions: SortedFileList[ReadableDSDLFile],
+    lookup_definitions: LookupDefinitionList,
     print_output_handler: PrintOutputHandler | None,
     allow_unregulated_fixed_port_id: bool,
     direct: set[CompositeType],
@@ -38,10 +43,6 @@ def _read_definitions(
             if dependency_dsdl_file.file_path not in file_pool:
                 _pending_definitions.add(dependency_dsdl_file)
 
-    def print_handler(file: Path, line: int, message: str) -> None:
-        if print_output_handler is not None:
-            print_output_handler(file, line, message)
-
     for target_definition in target_definitions:
 
         if not isinstance(target_definition, ReadableDSDLFile):
@@ -64,7 +65,11 @@ def _read_definitions(
             new_composite_type = target_definition.read(
                 lookup_definitions,
                 [_Callback()],
-                functools.partial(print_handler, target_definition.file_path),
+                (
+                    functools.partial(print_output_handler, target_definition.file_path)
+                    if print_output_handler is not None
+                    else _ignore_print_output
+                ),
                 allow_unregulated_fixed_port_id,
             )
         except FrontendError as ex:  # pragma: no cover
@@ -132,9 +137,17 @@ def read_definitions(
     _direct: set[CompositeType] = set()
     _transitive: set[CompositeType] = set()
     _file_pool: dict[Path, ReadableDSDLFile] = {}
+
+    # The target files are usually also present in the lookup set as separate objects. Substitute the targets into
+    # the lookup set so that each file is parsed at most once: the parsed type is cached per object, so otherwise
+    # a target referred to by another target would be parsed twice yielding two equal but distinct types.
+    # The lookup set is indexed once here and shared by all targets.
+    targets_by_path = {d.file_path: d for d in target_definitions if isinstance(d, ReadableDSDLFile)}
+    lookup_index = LookupDefinitionList(targets_by_path.get(d.file_path, d) for d in lookup_definitions)
+
     _read_definitions(
         target_definitions,
-        lookup_definitions,
+        lookup_index,
         print_output_handler,
         allow_unregulated_fixed_port_id,
         _direct,
@@ -356,6 +369,30 @@ def _unittest_namespace_reader_read_definitions_target_in_lookup(temp_dsdl_facto
     assert len(definitions.transitive) == 0
 
 
+def _unittest_namespace_reader_read_definitions_target_parsed_once(temp_dsdl_factory) -> None:  # type: ignore
+    """
+    A target that is also a dependency of another target shall be parsed only once.
+    """
+    from . import _dsdl_definition
+
+    paths = [
+        temp_dsdl_factory.new_file(Path("root", "ns", "Alberta.1.0.dsdl"), "@sealed"),
+        temp_dsdl_factory.new_file(Path("root", "ns", "Yukon.1.0.dsdl"), "@sealed\nns.Alberta.1.0 neighbor\n"),
+    ]
+
+    definitions = read_definitions(
+        [_dsdl_definition.DSDLDefinition(p, p.parent) for p in paths],
+        [_dsdl_definition.DSDLDefinition(p, p.parent) for p in paths],
+        None,
+        True,
+    )
+
+    assert len(definitions.direct) == 2
+    assert len(definitions.transitive) == 0
+    alberta, yukon = definitions.direct
+    assert yukon.fields[0].data_type is alberta
+
+
 def _unittest_namespace_reader_read_defs_target_dont_allow_unregulated(temp_dsdl_factory) -> None:  # type: ignore
     """
     Ensure that an error is raised when an invalid, fixed port ID is used without an override.
@@ -5,13 +5,13 @@
 from __future__ import annotations
 import typing
 import logging
-import itertools
 import functools
 import fractions
 from pathlib import Path
 from typing import cast, Tuple
 import parsimonious
 from parsimonious.nodes import Node as _Node
+from parsimonious.exceptions import UndefinedLabel
 from . import _error
 from . import _serializable
 from . import _expression
@@ -90,7 +90,8 @@ class StatementStreamProcessor:
 
 @functools.lru_cache(None)
 def _get_grammar() -> parsimonious.Grammar:
-    return parsimonious.Grammar((Path(__file__).parent / "grammar.parsimonious").read_text())  # type: ignore
+    text = (Path(__file__).parent / "grammar.parsimonious").read_bytes().decode("utf8")  # Locale-independent.
+    return parsimonious.Grammar(text)  # type: ignore
 
 
 _logger = logging.getLogger(__name__)
@@ -98,9 +99,18 @@ _logger = logging.getLogger(__name__)
 
 _Children = typing.Tuple[typing.Any, ...]
 _VisitorHandler = typing.Callable[["_ParseTreeProcessor", _Node, _Children], typing.Any]
+_BinaryOperator = typing.Union[
+    _expression.BinaryOperator[_expression.Any], _expression.AttributeOperator[_expression.Any]
+]
 _PrimitiveTypeConstructor = typing.Callable[[_serializable.PrimitiveType.CastMode], _serializable.PrimitiveType]
 
 
+# Child lifter handlers mapped to the expected type of the lifted child; see _ParseTreeProcessor.visit().
+_CHILD_LIFTER_TYPES: typing.Dict[_VisitorHandler, typing.Type[object]] = {
+    parsimonious.NodeVisitor.lift_child: object,
+}
+
+
 def _make_typesafe_child_lifter(expected_type: typing.Type[object]) -> _VisitorHandler:
     def visitor_handler(_self: "_ParseTreeProcessor", _n: _Node, children: _Children) -> typing.Any:
         (sole_child,) = children
@@ -111,13 +121,10 @@ def _make_typesafe_child_lifter(expected_type: typing.Type[object]) -> _VisitorH
         )
         return sole_child
 
+    _CHILD_LIFTER_TYPES[visitor_handler] = expected_type
     return visitor_handler
 
 
-def _make_binary_operator_handler(operator: _expression.BinaryOperator[_expression.OperatorOutput]) -> _VisitorHandler:
-    return lambda _self, _node, _children: operator
-
-
 # noinspection PyMethodMayBeStatic
 class _ParseTreeProcessor(parsimonious.NodeVisitor):
     """
@@ -138,7 +145,7 @@ class _ParseTreeProcessor(parsimonious.NodeVisitor):
         assert isinstance(statement_stream_processor, StatementStreamProcessor)
         self._statement_stream_processor = statement_stream_processor  # type: StatementStreamProcessor
         self._current_line_number = 1  # Lines are numbered from one
-        self._comment = ""
+        self._comment_lines: typing.List[str] = []  # Joined on flush to avoid quadratic string concatenation.
         self._comment_is_header = True
         super().__init__()
 
@@ -149,12 +156,58 @@ class _ParseTreeProcessor(parsimonious.NodeVisitor):
 
     # Misc. helpers
     def _flush_comment(self) -> None:
+        comment = "\n".join(self._comment_lines)
         if self._comment_is_header:
-            self._statement_stream_processor.on_header_comment(self._comment)
+            self._statement_stream_processor.on_header_comment(comment)
         else:
-            self._statement_stream_processor.on_attribute_comment(self._comment)
+            self._statement_stream_processor.on_attribute_comment(comment)
         self._comment_is_header = False
-        self._comment = ""
+        self._comment_lines.clear()
+
+    def visit(self, node: _Node) -> typing.Any:
+        """
+        Same as :meth:`parsimonious.NodeVisitor.visit` except that the handler is found in a table built once
+        instead of by a reflective attribute lookup with a freshly concatenated name for every parse tree node.
+        """
+        # This is the hottest function of the parser. Properties and bound methods are resolved only once per call.
+        name = node.expr.name
+        visit = self.visit
+        lifted_type = _CHILD_LIFTED_RULES.get(name)
+        if lifted_type is not None:
+            # Chains of single-child rules are very common (e.g., every expression descends through several of them),
+            # so the sole child is lifted here directly without building the list of children and calling the handler.
+            (sole_child,) = node.children
+            out = visit(sole_child)
+            assert isinstance(out, lifted_type), "The child should have been of type %r, not %r: %r" % (
+                lifted_type,
+                type(out),
+                out,
+            )
+            return out
+
+        if name in _OPERATOR_CHAIN_RULES:
+            head, tail = node.children
+            if not tail.children:
+                # Most operands are not followed by an operator, yet each of them descends through every
+                # precedence level; there is nothing to evaluate at such levels so the operand is passed through.
+                return visit(head)
+
+        handler = _VISITOR_HANDLERS.get(name)
+        children = node.children
+        if handler is None:
+            if not children:
+                # This is what generic_visit() would return. Such leaves are very common: most of them are
+                # empty optional or repeated expressions that are only inspected by the parent handler, if at all.
+                return node
+            handler = _ParseTreeProcessor.generic_visit
+        try:
+            return handler(self, node, tuple(map(visit, children)) if children else ())
+        except (parsimonious.VisitationError, UndefinedLabel):
+            raise  # Don't re-wrap already-wrapped exceptions.
+        except self.unwrapped_exceptions:
+            raise
+        except Exception as ex:
+            raise parsimonious.VisitationError(ex, type(ex), node) from ex  # type: ignore[no-untyped-call]
 
     def generic_visit(self, node: _Node, visited_children: typing.Sequence[typing.Any]) -> typing.Any:
         """If the node has children, replace the node with them."""
@@ -178,8 +231,9 @@ class _ParseTreeProcessor(parsimonious.NodeVisitor):
     def visit_comment(self, node: _Node, children: _Children) -> None:
         _ = children
         assert isinstance(node.text, str)
-        self._comment += "\n" if self._comment != "" else ""
-        self._comment += node.text[2:] if node.text.startswith("# ") else node.text[1:]
+        text = node.text[2:] if node.text.startswith("# ") else node.text[1:]
+        if self._comment_lines or text:  # Leading empty comment lines are dropped.
+            self._comment_lines.append(text)
 
     def visit_statement_constant(self, _n: _Node, children: _Children) -> None:
         constant_type, _sp0, name, _sp1, _eq, _sp2, exp = children
@@ -210,7 +264,7 @@ class _ParseTreeProcessor(parsimonious.NodeVisitor):
         assert isinstance(name, str) and name and isinstance(exp, _expression.Any)
         self._flush_comment()
         self._statement_stream_processor.on_directive(
-            line_number=self.current_line_number, directive_name=name, associated_expression_value=exp
+            line_number=self._current_line_number, directive_name=name, associated_expression_value=exp
         )
 
     def visit_statement_directive_without_expression(self, _n: _Node, children: _Children) -> None:
@@ -218,7 +272,7 @@ class _ParseTreeProcessor(parsimonious.NodeVisitor):
         assert isinstance(name, str) and name
         self._flush_comment()
         self._statement_stream_processor.on_directive(
-            line_number=self.current_line_number, directive_name=name, associated_expression_value=None
+            line_number=self._current_line_number, directive_name=name, associated_expression_value=None
         )
 
     def visit_identifier(self, node: _Node, _c: _Children) -> str:
@@ -251,12 +305,15 @@ class _ParseTreeProcessor(parsimonious.NodeVisitor):
         element_type, _s0, _bl, _s1, length, _s2, _br = children
         return _serializable.FixedLengthArrayType(element_type, _unwrap_array_capacity(length))
 
-    def visit_type_versioned(self, _n: _Node, children: _Children) -> _serializable.CompositeType:
+    def visit_type_versioned(self, node: _Node, children: _Children) -> _serializable.CompositeType:
         name, name_tail, _, version = children
         assert isinstance(name, str) and name and isinstance(version, _serializable.Version)
-        for _, component in name_tail:
-            assert isinstance(component, str)
-            name += _serializable.CompositeType.NAME_COMPONENT_SEPARATOR + component
+        if node.children[1].children:  # Relative references have no tail, so there is nothing to join.
+            components = [name]
+            for _, component in name_tail:
+                assert isinstance(component, str)
+                components.append(component)
+            name = _NAME_SEP.join(components)
 
         return self._statement_stream_processor.resolve_versioned_data_type(name, version)
 
@@ -288,7 +345,10 @@ class _ParseTreeProcessor(parsimonious.NodeVisitor):
     def visit_type_void(self, _n: _Node, children: _Children) -> _serializable.VoidType:
         _, width = children
         assert isinstance(width, int)
-        return _serializable.VoidType(width)
+        try:
+            return _VOID_TYPES[width]
+        except KeyError:
+            return _serializable.VoidType(width)  # Invalid width, let the constructor report the error.
 
     def visit_type_bit_length_suffix(self, node: _Node, _c: _Children) -> int:
         return int(node.text)
@@ -305,16 +365,14 @@ class _ParseTreeProcessor(parsimonious.NodeVisitor):
     visit_op2_exp = parsimonious.NodeVisitor.lift_child
 
     def visit_expression_list(self, _n: _Node, children: _Children) -> Tuple[_expression.Any, ...]:
-        out = []  # type: list[_expression.Any]
-        if children:
-            children = children[0]
-            assert len(children) == 2
-            out = [children[0]]
-            for _, _, _, exp in children[1]:
-                out.append(exp)
-
-        assert all(map(lambda x: isinstance(x, _expression.Any), out))
-        return tuple(out)
+        if not children:
+            return ()
+        ((head, tail),) = children
+        out = (head, *(exp for _, _, _, exp in tail))
+        if __debug__:  # The loop itself would not be removed in the optimized mode, only the assertion.
+            for x in out:
+                assert isinstance(x, _expression.Any)
+        return out
 
     def visit_expression_parenthesized(self, _n: _Node, children: _Children) -> _expression.Any:
         _, _, exp, _, _ = children
@@ -373,26 +431,8 @@ class _ParseTreeProcessor(parsimonious.NodeVisitor):
         assert isinstance(_op, _Node) and isinstance(exp, _expression.Any)
         return _expression.negative(exp)
 
-    visit_op2_log_or = _make_binary_operator_handler(_expression.logical_or)
-    visit_op2_log_and = _make_binary_operator_handler(_expression.logical_and)
-    visit_op2_cmp_equ = _make_binary_operator_handler(_expression.equal)
-    visit_op2_cmp_neq = _make_binary_operator_handler(_expression.not_equal)
-    visit_op2_cmp_leq = _make_binary_operator_handler(_expression.less_or_equal)
-    visit_op2_cmp_geq = _make_binary_operator_handler(_expression.greater_or_equal)
-    visit_op2_cmp_lss = _make_binary_operator_handler(_expression.less)
-    visit_op2_cmp_grt = _make_binary_operator_handler(_expression.greater)
-    visit_op2_bit_or = _make_binary_operator_handler(_expression.bitwise_or)
-    visit_op2_bit_xor = _make_binary_operator_handler(_expression.bitwise_xor)
-    visit_op2_bit_and = _make_binary_operator_handler(_expression.bitwise_and)
-    visit_op2_add_add = _make_binary_operator_handler(_expression.add)
-    visit_op2_add_sub = _make_binary_operator_handler(_expression.subtract)
-    visit_op2_mul_mul = _make_binary_operator_handler(_expression.multiply)
-    visit_op2_mul_div = _make_binary_operator_handler(_expression.divide)
-    visit_op2_mul_mod = _make_binary_operator_handler(_expression.modulo)
-    visit_op2_exp_pow = _make_binary_operator_handler(_expression.power)
-
-    def visit_op2_attrib(self, _n: _Node, _c: _Children) -> _expression.AttributeOperator[_expression.Any]:
-        return _expression.attribute
+    def _visit_binary_operator_token(self, node: _Node, _c: _Children) -> _BinaryOperator:
+        return _BINARY_OPERATORS[node.expr.name]  # Registered for every operator token rule, see below.
 
     # ================================================== Literals ==================================================
 
@@ -402,23 +442,33 @@ class _ParseTreeProcessor(parsimonious.NodeVisitor):
 
     def visit_literal_set(self, _n: _Node, children: _Children) -> _expression.Set:
         _, _, exp_list, _, _ = children
-        assert all(map(lambda x: isinstance(x, _expression.Any), exp_list))
-        return _expression.Set(exp_list)
+        return _expression.Set(exp_list)  # The elements are checked by visit_expression_list() and by Set().
 
     def visit_literal_real(self, node: _Node, _c: _Children) -> _expression.Rational:
-        return _expression.Rational(fractions.Fraction(node.text.replace("_", "")))
+        return _parse_real_literal(node.text)
+
+    # The base is known from the grammar rule, so the prefix need not be sniffed by int(..., base=0).
+    # The digit grouping rules of the grammar match those of int(), which accepts the base prefix and the
+    # underscores as-is, so the literal text is not copied before conversion.
+    visit_literal_integer = _make_typesafe_child_lifter(_expression.Rational)
+
+    def visit_literal_integer_binary(self, node: _Node, _c: _Children) -> _expression.Rational:
+        return _make_integer_literal(int(node.text, 2))
 
-    def visit_literal_integer(self, node: _Node, _c: _Children) -> _expression.Rational:
-        return _expression.Rational(int(node.text.replace("_", ""), base=0))
+    def visit_literal_integer_octal(self, node: _Node, _c: _Children) -> _expression.Rational:
+        return _make_integer_literal(int(node.text, 8))
+
+    def visit_literal_integer_hexadecimal(self, node: _Node, _c: _Children) -> _expression.Rational:
+        return _make_integer_literal(int(node.text, 16))
 
     def visit_literal_integer_decimal(self, node: _Node, _c: _Children) -> _expression.Rational:
-        return _expression.Rational(int(node.text.replace("_", "")))
+        return _make_integer_literal(int(node.text))
 
     def visit_literal_boolean_true(self, _n: _Node, _c: _Children) -> _expression.Boolean:
-        return _expression.Boolean(True)
+        return _TRUE
 
     def visit_literal_boolean_false(self, _n: _Node, _c: _Children) -> _expression.Boolean:
-        return _expression.Boolean(False)
+        return _FALSE
 
     def visit_literal_string_single_quoted(self, node: _Node, _c: _Children) -> _expression.String:
         return _parse_string_literal(node.text)
@@ -427,6 +477,50 @@ class _ParseTreeProcessor(parsimonious.NodeVisitor):
         return _parse_string_literal(node.text)
 
 
+# Binary operator tokens evaluate to the operator itself; the chain handler applies it to the operands.
+_BINARY_OPERATORS: typing.Dict[str, _BinaryOperator] = {
+    "op2_log_or": _expression.logical_or,
+    "op2_log_and": _expression.logical_and,
+    "op2_cmp_equ": _expression.equal,
+    "op2_cmp_neq": _expression.not_equal,
+    "op2_cmp_leq": _expression.less_or_equal,
+    "op2_cmp_geq": _expression.greater_or_equal,
+    "op2_cmp_lss": _expression.less,
+    "op2_cmp_grt": _expression.greater,
+    "op2_bit_or": _expression.bitwise_or,
+    "op2_bit_xor": _expression.bitwise_xor,
+    "op2_bit_and": _expression.bitwise_and,
+    "op2_add_add": _expression.add,
+    "op2_add_sub": _expression.subtract,
+    "op2_mul_mul": _expression.multiply,
+    "op2_mul_div": _expression.divide,
+    "op2_mul_mod": _expression.modulo,
+    "op2_exp_pow": _expression.power,
+    "op2_attrib": _expression.attribute,
+}
+
+# Maps grammar rule names to the visitor handlers of _ParseTreeProcessor; see _ParseTreeProcessor.visit().
+_VISITOR_HANDLERS: typing.Dict[str, _VisitorHandler] = {
+    name[len("visit_") :]: getattr(_ParseTreeProcessor, name)
+    for name in dir(_ParseTreeProcessor)
+    if name.startswith("visit_")
+}
+_VISITOR_HANDLERS.update(
+    dict.fromkeys(
+        _BINARY_OPERATORS,
+        _ParseTreeProcessor._visit_binary_operator_token,  # pylint: disable=protected-access
+    )
+)
+_CHILD_LIFTED_RULES: typing.Dict[str, typing.Type[object]] = {
+    name: _CHILD_LIFTER_TYPES[handler] for name, handler in _VISITOR_HANDLERS.items() if handler in _CHILD_LIFTER_TYPES
+}
+_OPERATOR_CHAIN_RULES = frozenset(
+    name
+    for name, handler in _VISITOR_HANDLERS.items()
+    if handler is _ParseTreeProcessor._visit_binary_operator_chain  # pylint: disable=protected-access
+)
+
+
 #
 # Internal helper functions.
 #
@@ -439,61 +533,97 @@ def _unwrap_array_capacity(ex: _expression.Any) -> int:
     raise _error.InvalidDefinitionError("Array capacity expression must yield a rational, not %s" % ex.TYPE_NAME)
 
 
+@functools.lru_cache(maxsize=1024)  # Parsing fractions is slow and the same real literals tend to recur.
+def _parse_real_literal(literal: str) -> _expression.Rational:
+    return _expression.Rational(fractions.Fraction(literal.replace("_", "")))
+
+
+# Rationals are immutable, so the small integers that make up most of the literals are instantiated only once.
+_SMALL_INTEGERS = tuple(_expression.Rational(i) for i in range(1025))
+
+
+def _make_integer_literal(value: int) -> _expression.Rational:
+    try:
+        return _SMALL_INTEGERS[value]  # Literals are never negative; the sign is a separate unary operator.
+    except IndexError:
+        return _expression.Rational(value)
+
+
+# Boolean literals are immutable, so they are instantiated only once.
+_TRUE = _expression.Boolean(True)
+_FALSE = _expression.Boolean(False)
+
+_NAME_SEP = _serializable.CompositeType.NAME_COMPONENT_SEPARATOR
+
+# Void types are immutable, so the padding fields of all definitions can share the same instances.
+_VOID_TYPES = {i: _serializable.VoidType(i) for i in range(1, _serializable.VoidType.MAX_BIT_LENGTH + 1)}
+
+_STRING_ESCAPE_SEQUENCES = {
+    "r": "\r",
+    "n": "\n",
+    "t": "\t",
+    '"': '"',
+    "'": "'",
+    "\\": "\\",
+}
+
+
+@functools.lru_cache(maxsize=4096)  # The result is immutable; identical literals are common across definitions.
 def _parse_string_literal(literal: str) -> _expression.String:
     assert literal[0] == literal[-1]
     assert literal[0] in "'\""
     assert len(literal) >= 2
 
     quote_symbol = literal[0]
-    iterator = iter(literal[1:-1])
-
-    def _next_symbol() -> str:
+    body = literal[1:-1]
+    if "\\" not in body:  # Fast path: nothing to unescape, which is the case for most literals.
+        assert quote_symbol not in body, "Unescaped quotes cannot appear inside string literals. Bad grammar?"
+        return _expression.String(body)
+
+    # The runs of ordinary symbols between the escape sequences are copied in bulk.
+    out = []  # type: typing.List[str]
+    position = 0
+    while True:
+        escape_position = body.find("\\", position)
+        chunk = body[position:] if escape_position < 0 else body[position:escape_position]
+        assert quote_symbol not in chunk, "Unescaped quotes cannot appear inside string literals. Bad grammar?"
+        out.append(chunk)
+        if escape_position < 0:
+            break
         try:
-            s = next(iterator)  # type: str
-        except StopIteration:
-            return ""
-
-        if s != "\\":
-            assert s != quote_symbol, "Unescaped quotes cannot appear inside string literals. Bad grammar?"
-            return s
-
-        s = next(iterator)
-        if s in "uU":
-            h = ""
-            for _ in range(4 if s.islower() else 8):
-                s = next(iterator).lower()
-                if s not in "0123456789abcdef":
-                    raise DSDLSyntaxError("Invalid hex character: %r" % s)
-                h += s
-            return chr(int(h, 16))
-
-        try:
-            return {
-                "r": "\r",
-                "n": "\n",
-                "t": "\t",
-                '"': '"',
-                "'": "'",
-                "\\": "\\",
-            }[s.lower()]
-        except KeyError:
-            raise DSDLSyntaxError("Invalid escape sequence") from None
-
-    out = ""
-    for index in itertools.count():  # pragma: no branch
-        try:
-            symbol = _next_symbol()
+            symbol, position = _unescape(body, escape_position + 1)
         except DSDLSyntaxError as ex:
+            index = sum(map(len, out))
             raise DSDLSyntaxError("The string literal is malformed after index %d: %s" % (index, ex.text)) from None
-        except StopIteration:
+        except IndexError:
+            index = sum(map(len, out))
             raise DSDLSyntaxError("Unexpected end of string literal after index %d" % index) from None
-        else:
-            if len(symbol) == 0:
-                break
-            assert len(symbol) == 1
-            out += symbol
+        out.append(symbol)
 
-    return _expression.String(out)
+    return _expression.String("".join(out))
+
+
+def _unescape(body: str, position: int) -> typing.Tuple[str, int]:
+    """
+    Decodes the escape sequence whose backslash precedes the specified position.
+    Returns the decoded symbol and the position right after the sequence.
+    Raises IndexError if the sequence is truncated.
+    """
+    s = body[position]
+    if s in "uU":
+        width = 4 if s.islower() else 8
+        h = body[position + 1 : position + 1 + width]
+        for c in h:
+            if c.lower() not in "0123456789abcdef":
+                raise DSDLSyntaxError("Invalid hex character: %r" % c.lower())
+        if len(h) < width:
+            raise IndexError
+        return chr(int(h, 16)), position + 1 + width
+
+    try:
+        return _STRING_ESCAPE_SEQUENCES[s.lower()], position + 1
+    except KeyError:
+        raise DSDLSyntaxError("Invalid escape sequence") from None
 
 
 def _unittest_parse_string_literal() -> None:
@@ -543,3 +673,19 @@ def _unittest_parse_string_literal() -> None:
     once('"evening"', "evening")  # okay we support English, cool
     once('"вечер"', "вечер")  # and Russian too
     once('"õhtust"', "õhtust")  # heck, even Estonian
+
+
+def _unittest_make_integer_literal() -> None:
+    assert _make_integer_literal(0) is _make_integer_literal(0)
+    assert _make_integer_literal(1024) is _make_integer_literal(1024)
+    assert _make_integer_literal(1025) == _expression.Rational(1025)
+    assert _make_integer_literal(2**64).as_native_integer() == 2**64
+
+
+def _unittest_binary_operator_rules() -> None:
+    grammar = _get_grammar()
+    assert all(name in grammar for name in _BINARY_OPERATORS)
+    # Every operator token of the grammar has to be covered, otherwise it would evaluate to a tuple or a node.
+    assert {name for name in grammar if name.startswith("op2_") and name.count("_") == 2} | {"op2_attrib"} == set(
+        _BINARY_OPERATORS
+    )
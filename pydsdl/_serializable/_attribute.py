@@ -18,6 +18,10 @@ class InvalidTypeError(TypeParameterError):
 
 
 class Attribute(_expression.Any):
+    # There may be many thousands of attributes in a large namespace, hence the slots. The instance dict is created
+    # only when needed, so that the users can still attach their own attributes and refer to the instances weakly.
+    __slots__ = ("_data_type", "_name", "_doc", "__dict__", "__weakref__")
+
     def __init__(self, data_type: SerializableType, name: str, doc: str = ""):
         self._data_type = data_type
         self._name = str(name)
@@ -60,10 +64,12 @@ class Attribute(_expression.Any):
 
 
 class Field(Attribute):
-    pass
+    __slots__ = ()
 
 
 class PaddingField(Field):
+    __slots__ = ()
+
     def __init__(self, data_type: VoidType, doc: str = ""):
         if not isinstance(data_type, VoidType):
             raise TypeParameterError("Padding fields must be of the void type")
@@ -72,6 +78,8 @@ class PaddingField(Field):
 
 
 class Constant(Attribute):
+    __slots__ = ("_value",)
+
     def __init__(self, data_type: SerializableType, name: str, value: _expression.Any, doc: str = ""):
         super().__init__(data_type, name, doc)
 
@@ -195,3 +203,12 @@ def _unittest_attribute() -> None:
     assert Constant(data_type, "FOO_CONST", _expression.Rational(-124)) != const
     assert hash(Constant(data_type, "FOO_CONST", _expression.Rational(-123))) == hash(const)
     assert hash(Constant(data_type, "FOO_CONST", _expression.Rational(-124))) != hash(const)
+
+    import pickle
+    import weakref
+
+    assert pickle.loads(pickle.dumps(const)) == const
+    const.custom = 123  # type: ignore
+    assert pickle.loads(pickle.dumps(const)).custom == 123
+    assert weakref.ref(const)() is const
+    assert pickle.loads(pickle.dumps(PaddingField(VoidType(3), "doc"))).doc == "doc"
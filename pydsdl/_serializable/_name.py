@@ -22,23 +22,25 @@ def check_name(name: str) -> None:
 
     name = name.lower()
 
-    if name[0] not in _VALID_FIRST_CHARACTERS_OF_NAME:
-        raise InvalidNameError("Name or namespace component cannot start with %r" % name[0])
-
-    for char in name:
-        if char not in _VALID_CONTINUATION_CHARACTERS_OF_NAME:
-            raise InvalidNameError("Name or namespace component cannot contain %r" % char)
-
-    for pat in _DISALLOWED_NAME_PATTERNS:
-        if isinstance(pat, str):
-            if pat == name:
-                raise InvalidNameError("Disallowed name: %r matches the following string: %s" % (name, pat))
-        elif pat.match(name):
-            raise InvalidNameError("Disallowed name: %r matches the following pattern: %s" % (name, pat))
+    if not _VALID_NAME_REGEX.match(name):  # The slow character-wise scan is only needed to report the culprit.
+        if name[0] not in _VALID_FIRST_CHARACTERS_OF_NAME:
+            raise InvalidNameError("Name or namespace component cannot start with %r" % name[0])
+        for char in name:
+            if char not in _VALID_CONTINUATION_CHARACTERS_OF_NAME:
+                raise InvalidNameError("Name or namespace component cannot contain %r" % char)
+
+    if name in _DISALLOWED_NAMES:
+        raise InvalidNameError("Disallowed name: %r matches the following string: %s" % (name, name))
+    if _DISALLOWED_NAME_REGEX.match(name):  # The individual patterns are only scanned to report the culprit.
+        for pat in _DISALLOWED_NAME_PATTERNS:
+            if not isinstance(pat, str) and pat.match(name):
+                raise InvalidNameError("Disallowed name: %r matches the following pattern: %s" % (name, pat))
+        assert False  # pragma: no cover
 
 
 _VALID_FIRST_CHARACTERS_OF_NAME = string.ascii_letters + "_"
 _VALID_CONTINUATION_CHARACTERS_OF_NAME = _VALID_FIRST_CHARACTERS_OF_NAME + string.digits
+_VALID_NAME_REGEX = re.compile(r"[a-z_][a-z0-9_]*\Z")  # Applied to the lowercased name.
 
 # Disallowed name patterns apply to any part of any name, e.g., an attribute name, a namespace component,
 # type name, etc. The pattern must produce an exact match to trigger a name error. All patterns are case-insensitive.
@@ -73,6 +75,10 @@ _DISALLOWED_NAME_PATTERNS: List[Union[str, Pattern[str]]] = [
     re.compile(r"lpt\d$"),
     re.compile(r"_.*_$"),
 ]
+_DISALLOWED_NAMES = frozenset(x for x in _DISALLOWED_NAME_PATTERNS if isinstance(x, str))
+_DISALLOWED_NAME_REGEX = re.compile(
+    "|".join("(?:%s)" % x.pattern for x in _DISALLOWED_NAME_PATTERNS if not isinstance(x, str))
+)
 
 
 def _unittest_check_name() -> None:
@@ -423,6 +423,49 @@ def _unittest_comments(wrkspc: Workspace) -> None:
 
     assert p.constants[0].doc == ""
 
+    bare = wrkspc.parse_new(
+        "another/Bare.1.0.dsdl",
+        dedent(
+            """\
+        #
+        # Header
+        #
+
+        uint8 a
+        #
+        # field doc
+        uint8 b
+        #
+        @sealed
+        """
+        ),
+    )
+
+    p = parse_definition(bare, [])
+    assert p.doc == "Header\n"  # Leading empty comment lines are dropped, trailing ones are kept.
+    assert p.fields[0].doc == "field doc"
+    assert p.fields[1].doc == ""
+
+    bare_service = wrkspc.parse_new(
+        "another/301.BareService.1.0.dsdl",
+        dedent(
+            """\
+        #
+        # req
+        @sealed
+        ---
+        #
+        # resp
+        @sealed
+        """
+        ),
+    )
+
+    p = parse_definition(bare_service, [])
+    req, res = [x.data_type for x in p.fields]
+    assert req.doc == "req"  # type: ignore
+    assert res.doc == "resp"  # type: ignore
+
 
 # noinspection PyProtectedMember,PyProtectedMember
 
@@ -602,12 +645,18 @@ def _unittest_error(wrkspc: Workspace) -> None:
             ],
         )
 
-    with raises(_data_type_builder.UndefinedDataTypeError):
+    with raises(_data_type_builder.UndefinedDataTypeError, match=r"(?i).*circular.*") as ei:
         defs = [
             wrkspc.parse_new("vendor/circular_dependency/A.1.0.dsdl", "B.1.0 b\n@sealed"),
             wrkspc.parse_new("vendor/circular_dependency/B.1.0.dsdl", "A.1.0 b\n@sealed"),
         ]
         parse_definition(defs[0], defs)
+    assert ei.value.path is not None and ei.value.path.name == "B.1.0.dsdl"
+    assert ei.value.line == 1
+
+    with raises(_data_type_builder.UndefinedDataTypeError, match=r"(?i).*circular.*"):
+        defs = [wrkspc.parse_new("vendor/circular_dependency/Self.1.0.dsdl", "@sealed\nSelf.1.0 s")]
+        parse_definition(defs[0], defs)
 
     with raises(_error.InvalidDefinitionError, match="(?i).*union directive.*"):
         parse_definition(
@@ -1968,6 +2017,8 @@ def _unittest_dsdl_parser_expressions(wrkspc: Workspace) -> None:
                 @assert true
                 @assert 1 == 2 - 1
                 @assert -10 == +20 / -2
+                @assert {255} == {0x_Ff, 0XF_F, 0b1111_1111, 0B_1111_1111, 0o_377, 0O3_77, 2_5_5}
+                @assert {0} == {0_0, 00, 0x0, 0b0, 0o0}
                 @assert {10, 15, 20} % 5 == {0}
                 @assert {10, 15, 20} % 5 == {1, 2, 3} * 0
                 @assert {10, 15, 20} / 5 == {2, 3, 4} * 10 / 5 / 2